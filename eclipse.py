@@ -1,18 +1,25 @@
 import datetime
+import io
+import math
 import os
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import yaml
-from PIL import Image, ImageDraw, ImageEnhance
-from PIL.ExifTags import Base
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QMouseEvent, QPainter, QPixmap
+from PIL import Image, ImageDraw, ImageStat
+from PIL.ExifTags import IFD, Base
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QColor, QImage, QMouseEvent, QPainter, QPixmap
 from PySide6.QtWidgets import (
     QApplication,
     QCheckBox,
     QFormLayout,
     QGraphicsItem,
+    QGraphicsPixmapItem,
     QGraphicsScene,
+    QGraphicsTextItem,
     QGraphicsView,
     QHBoxLayout,
     QLabel,
@@ -24,7 +31,21 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from PIL import ImageQt  # isort:skip
+# Use the libyaml bindings if available
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def pil_to_qpixmap(image: Image.Image):
+    """Convert a PIL image to a QPixmap."""
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    data = image.tobytes()
+    # The QImage shares the buffer, which QPixmap.fromImage copies while it's still alive
+    qimage = QImage(
+        data, image.width, image.height, image.width * 3, QImage.Format.Format_RGB888
+    )
+    return QPixmap.fromImage(qimage)
 
 
 class DraggableLabel(QLabel):
@@ -51,6 +72,28 @@ class DraggableLabel(QLabel):
         self.last_pos = new_pos
 
 
+class LRUCache:
+    """A cache that forgets its least recently used entries beyond a maximum number of entries."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        """Return the cached value for the key, or None if it isn't cached."""
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Cache the value for the key, forgetting the oldest entries if there are too many."""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
 class EclipsePicture:
     """A class to represent an eclipse picture and its configuration."""
 
@@ -59,8 +102,13 @@ class EclipsePicture:
         print("\rOpening image", filename, end="")
         self.image = Image.open(filename)
         self.date = datetime.datetime.strptime(self.image._getexif()[Base.DateTimeOriginal], "%Y:%m:%d %H:%M:%S")  # type: ignore
+        self.ts = self.date.timestamp()
+        self.time_str = self.date.strftime("%H:%M:%S")
         self.loaded = False
 
+        # The thumbnail embedded in the EXIF data, used for the small previews
+        self._thumbnail = self.load_thumbnail()
+
         # The center of the sun
         self.cx = self.image.width // 2
         self.cy = self.image.height // 2
@@ -82,62 +130,165 @@ class EclipsePicture:
         # Whether to include this image in the final collage
         self.included = True
 
-        # Cached images
-        self._configured_image = None
-        self._configured_image_best = {}
-        self._configured_image_small = None
+        # Copies of the image decoded at reduced resolution, by reduction factor
+        self._drafts = {}
 
-    def invalidate(self):
-        """Invalidate the cached images."""
-        self._configured_image = None
+        # Cached images, by size and configuration parameters
+        self._lock = threading.Lock()
+        # Keep the previous preview too, so undoing a tweak doesn't re-render
+        self._configured_image = LRUCache(2)
+        # Full-size images are big, so only keep the latest of each size
         self._configured_image_best = {}
-        self._configured_image_small = None
+        self._configured_image_small = LRUCache(256)
 
-    def adjust_brightness(self, image: Image.Image):
-        """Adjust the brightness of the image according to the configuration."""
-        if self.brightness == 100:
-            return image
-        enhancer = ImageEnhance.Brightness(image)
-        return enhancer.enhance(self.brightness / 100)
+    def load_thumbnail(self):
+        """Load the JPEG thumbnail embedded in the EXIF data.
+        Returns None if there is none or if it doesn't have the same proportions as the image.
+        """
+        try:
+            ifd1 = self.image.getexif().get_ifd(IFD.IFD1)
+            # The offset is relative to the TIFF header, which follows "Exif\0\0"
+            start = 6 + ifd1[Base.JpegIFOffset]
+            end = start + ifd1[Base.JpegIFByteCount]
+            thumbnail = Image.open(io.BytesIO(self.image.info["exif"][start:end]))
+            thumbnail.load()
+        except (KeyError, OSError, ValueError):
+            return None
+        # Letterboxed thumbnails can't be mapped onto the image
+        expected_height = thumbnail.width * self.image.height / self.image.width
+        if abs(thumbnail.height - expected_height) > 1:
+            return None
+        return thumbnail
+
+    def draft(self, scale: float):
+        """Return the image decoded at the lowest resolution that still has at least one pixel
+        per `scale` pixels of the full image, and the number of full image pixels per pixel of it.
+        JPEG images can be decoded at 1/2, 1/4 or 1/8 resolution much faster than in full.
+        """
+        factor = 8
+        while factor > 1 and factor > scale:
+            factor //= 2
+        # Other formats can only be decoded in full, so don't keep another copy
+        if factor == 1 or self.image.format != "JPEG":
+            return self.image, 1
+        if factor not in self._drafts:
+            image = Image.open(self.filename)
+            image.draft("RGB", (image.width // factor, image.height // factor))
+            self._drafts[factor] = image
+        image = self._drafts[factor]
+        return image, self.image.width / image.width
+
+    @property
+    def _param_key(self):
+        """The configuration parameters that affect the configured images."""
+        return (
+            self.cx,
+            self.cy,
+            self.rotate,
+            self.zoom,
+            self.brightness,
+            self.contrast,
+        )
 
-    def adjust_contrast(self, image: Image.Image):
-        """Adjust the contrast of the image according to the configuration."""
-        if self.contrast == 100:
+    def adjust_levels(self, image: Image.Image):
+        """Adjust the brightness and contrast of the image according to the configuration,
+        using a single lookup table."""
+        if self.brightness == 100 and self.contrast == 100:
             return image
-        enhancer = ImageEnhance.Contrast(image)
-        return enhancer.enhance(self.contrast / 100)
+        return image.point(self._levels_lut(image) * len(image.getbands()))
+
+    def _levels_lut(self, image: Image.Image):
+        """Return the lookup table adjusting a band of the image for brightness and contrast."""
+        # Brighten first, blending every value with black like ImageEnhance.Brightness
+        # so that the rounding and clipping match exactly
+        values = Image.frombytes("L", (256, 1), bytes(range(256)))
+        black = Image.new("L", values.size)
+        values = Image.blend(black, values, self.brightness / 100)
+        brightened = list(values.tobytes())
+        if self.contrast == 100:
+            return brightened
+
+        # Then, like ImageEnhance.Contrast, pivot the contrast around the mean luminance
+        # of the brightened image, measured the same way so that the result matches exactly
+        bands = len(image.getbands())
+        brightened_image = image.point(brightened * bands)
+        mean = int(ImageStat.Stat(brightened_image.convert("L")).mean[0] + 0.5)
+
+        gray = Image.new("L", values.size, mean)
+        return list(Image.blend(gray, values, self.contrast / 100).tobytes())
+
+    def _warp(
+        self,
+        image: Image.Image,
+        cx: float,
+        cy: float,
+        size: int,
+        scale: float,
+        resample: Image.Resampling,
+        reduce=False,
+    ):
+        """Crop, stretch and rotate the part of the image centered on (cx, cy) into a square of the given size
+        using a single affine transform. The scale is the number of source pixels per output pixel.
+        If reduce is set, the source is first box-filtered by the integer part of the scale so that
+        downsampling doesn't alias."""
+        factor = int(scale)
+        if reduce and factor > 1:
+            # Only reduce the region that can end up in the output, whatever the rotation
+            radius = scale * size
+            box = (
+                max(0, int(cx - radius)),
+                max(0, int(cy - radius)),
+                min(image.width, int(cx + radius)),
+                min(image.height, int(cy + radius)),
+            )
+            if box[0] < box[2] and box[1] < box[3]:
+                image = image.reduce(factor, box)
+                cx = (cx - box[0]) / factor
+                cy = (cy - box[1]) / factor
+                scale /= factor
+
+        # Map each output pixel back to the source: rotate about the center, then scale
+        angle = math.radians(self.rotate)
+        cos = math.cos(angle) * scale
+        sin = math.sin(angle) * scale
+        half = size / 2
+        matrix = (
+            cos,
+            -sin,
+            cx - (cos - sin) * half,
+            sin,
+            cos,
+            cy - (sin + cos) * half,
+        )
+        return image.transform(
+            (size, size), Image.Transform.AFFINE, matrix, resample=resample
+        )
 
     def configured(self):
         """Return the image configured according to the current configuration, optimized for speed.
         Includes additional elements for alignment."""
         # Return the cached image if available
-        if self._configured_image:
-            return self._configured_image
+        key = self._param_key
+        image = self._configured_image.get(key)
+        if image:
+            return image
 
         print("\rConfiguring image", self.filename, end="")
-        image = self.image
-
-        # First crop to twice the desired size (without zooming)
-        left = self.cx - self.width * (100 / self.zoom)
-        top = self.cy - self.height * (100 / self.zoom)
-        right = self.cx + self.width * (100 / self.zoom)
-        bottom = self.cy + self.height * (100 / self.zoom)
-        image = image.crop((int(left), int(top), int(right), int(bottom)))
-
-        # Then stretch to twice the desired size
-        image = image.resize((self.width, self.height), Image.Resampling.NEAREST)
-
-        # Then rotate
-        if self.rotate:
-            image = image.rotate(
-                self.rotate,
-                Image.Resampling.NEAREST,
-                center=(self.width / 2, self.height / 2),
-            )
+        scale = 200 / self.zoom
+        image, factor = self.draft(scale)
+
+        # Crop, stretch and rotate in one pass
+        image = self._warp(
+            image,
+            self.cx / factor,
+            self.cy / factor,
+            self.width,
+            scale / factor,
+            Image.Resampling.NEAREST,
+        )
 
         # Then adjust brightness and contrast
-        image = self.adjust_brightness(image)
-        image = self.adjust_contrast(image)
+        image = self.adjust_levels(image)
         draw = ImageDraw.ImageDraw(image)
 
         # Draw a colored patch to adjust brightness by
@@ -169,84 +320,78 @@ class EclipsePicture:
         )
 
         # Cache the configured image
-        self._configured_image = image
+        self._configured_image.put(key, image)
         return image
 
     def configured_best(self, size=640):
         """Return the image configured according to the current configuration, optimized for quality."""
+        # Only render each image once, even if requested from several threads
+        with self._lock:
+            return self._configured_best(size)
+
+    def _configured_best(self, size: int):
+        """Render the best quality image. Must be called with the lock held."""
         # Return the cached image if available
-        if self._configured_image_best.get(size, None):
-            return self._configured_image_best[size]
+        key = self._param_key
+        cached = self._configured_image_best.get(size)
+        if cached and cached[0] == key:
+            return cached[1]
 
         print("\rConfiguring best image", self.filename, end="")
-        image = self.image
-
-        # First crop to twice the desired size (without zooming)
-        left = self.cx - self.width * 200 / self.zoom
-        top = self.cy - self.height * 200 / self.zoom
-        right = self.cx + self.width * 200 / self.zoom
-        bottom = self.cy + self.height * 200 / self.zoom
-        image = image.crop((int(left), int(top), int(right), int(bottom)))
-
-        # Then stretch to twice the desired size
-        image = image.resize((size * 2, size * 2), Image.Resampling.BICUBIC)
-
-        # Then rotate
-        if self.rotate:
-            image = image.rotate(
-                self.rotate,
-                Image.Resampling.BICUBIC,
-                center=(size, size),
-            )
 
-        # Then crop to the desired size
-        left = size * 0.5
-        top = size * 0.5
-        right = size * 1.5
-        bottom = size * 1.5
-        image = image.crop((int(left), int(top), int(right), int(bottom)))
+        # Crop, stretch and rotate in one pass
+        image = self._warp(
+            self.image,
+            self.cx,
+            self.cy,
+            size,
+            self.width * 200 / (self.zoom * size),
+            Image.Resampling.BICUBIC,
+            reduce=True,
+        )
 
         # Then adjust brightness and contrast
-        image = self.adjust_brightness(image)
-        image = self.adjust_contrast(image)
+        image = self.adjust_levels(image)
 
         # Cache the configured image
-        self._configured_image_best[size] = image
+        self._configured_image_best[size] = (key, image)
         return image
 
     def configured_small(self, size=20):
         """Return a small version of the image configured according to the current configuration."""
         # Return the cached image if available
-        if self._configured_image_small:
-            return self._configured_image_small
+        key = (size, *self._param_key)
+        image = self._configured_image_small.get(key)
+        if image:
+            return image
 
         print("\rConfiguring small image", self.filename, end="")
-        image = self.image
-
-        # First crop to the desired size (without zooming)
-        left = self.cx - self.width * (50 / self.zoom)
-        top = self.cy - self.height * (50 / self.zoom)
-        right = self.cx + self.width * (50 / self.zoom)
-        bottom = self.cy + self.height * (50 / self.zoom)
-        image = image.crop((int(left), int(top), int(right), int(bottom)))
-
-        # Then stretch to the desired size
-        image = image.resize((size, size), Image.Resampling.NEAREST)
-
-        # Then rotate
-        if self.rotate:
-            image = image.rotate(
-                self.rotate,
-                Image.Resampling.NEAREST,
-                center=(size / 2, size / 2),
-            )
+
+        # Use the thumbnail instead of decoding the image if it has enough detail
+        # (a little stretching doesn't show at this size)
+        scale = self.width * 100 / (self.zoom * size)
+        thumbnail = self._thumbnail
+        if thumbnail and scale * thumbnail.width / self.image.width >= 0.5:
+            image, factor = thumbnail, self.image.width / thumbnail.width
+        else:
+            image, factor = self.draft(scale)
+
+        # Crop, shrink and rotate, box-filtering so the icon averages the pixels it covers
+        image = self._warp(
+            image,
+            self.cx / factor,
+            self.cy / factor,
+            size,
+            scale / factor,
+            Image.Resampling.NEAREST,
+            reduce=True,
+        )
 
         # Then adjust brightness and contrast
-        image = self.adjust_brightness(image)
-        image = self.adjust_contrast(image)
+        image = self.adjust_levels(image)
 
         # Cache the configured image
-        self._configured_image_small = image
+        self._configured_image_small.put(key, image)
         return image
 
     def load_config(self):
@@ -254,7 +399,7 @@ class EclipsePicture:
         print("\rLoading image details", self.filename, end="")
         try:
             with open(self.filename + ".yml") as f:
-                data: dict = yaml.safe_load(f)
+                data: dict = yaml.load(f, Loader=Loader)
                 self.cx = data["cx"]
                 self.cy = data["cy"]
                 self.rotate = data["rotate"]
@@ -280,6 +425,7 @@ class EclipsePicture:
                     "contrast": self.contrast,
                 },
                 f,
+                Dumper=Dumper,
             )
 
 
@@ -310,6 +456,9 @@ class Collage:
     def render(self):
         """Render the collage."""
         collage = Image.new("RGB", (self.width, self.height), "white")
+
+        # Lay out the images first, so they can be rendered in parallel
+        placements = []
         x = 0
         y = 0
         i = 0
@@ -319,13 +468,21 @@ class Collage:
             s = self.img_size
             if i == self.central_index:
                 s = self.width
-            img = image.configured_best(s)
-            collage.paste(img, (x, y))
-            x += img.width
+            placements.append((x, y, image, s))
+            x += s
             if x >= self.width:
                 x = 0
-                y += img.height
+                y += s
             i += 1
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = {
+                executor.submit(image.configured_best, s): (x, y)
+                for x, y, image, s in placements
+            }
+            # Paste each image as soon as it is ready, while the others are still rendering
+            for future in as_completed(futures):
+                collage.paste(future.result(), futures.pop(future))
         return collage
 
 
@@ -340,26 +497,49 @@ class ImageTimeline(QGraphicsView):
         self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
         self.setRenderHint(QPainter.RenderHint.TextAntialiasing)
 
+        # The items shown for each image, and the parameters its pixmap was rendered with
+        self.items_: dict[
+            EclipsePicture, tuple[QGraphicsTextItem, QGraphicsPixmapItem, tuple | None]
+        ] = {}
+
+        # The images and their vertical positions, which only change with the list of images
+        self.images: list[EclipsePicture] = []
+        self.positions: list[float] = []
+
     def set_images(self, images: list[EclipsePicture]):
         """Update the list of images to display."""
-        self.scene_.clear()
-        starttime = None
-        for i, image in enumerate(images):
-            if starttime is None:
-                starttime = image.date.timestamp()
-                y = 0
-            else:
-                y = (image.date.timestamp() - starttime) / 5
+        if images != self.images:
+            self.images = list(images)
+            starttime = images[0].ts if images else 0
+            self.positions = [(image.ts - starttime) / 5 for image in images]
+
+        shown = set()
+        for image, y in zip(self.images, self.positions):
             if not image.included:
                 continue
-            item = self.scene_.addText(image.date.strftime("%H:%M:%S"))
-            item.setPos(10, y)
-            pyimg = image.configured_small(20)
-            image = ImageQt.ImageQt(pyimg)
-            pixmap = QPixmap.fromImage(image)
-            item = self.scene_.addPixmap(pixmap)
-            item.setPos(100, y)
-            item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsFocusable)
+            shown.add(image)
+            if image in self.items_:
+                text_item, pixmap_item, key = self.items_[image]
+            else:
+                text_item = self.scene_.addText(image.time_str)
+                pixmap_item = self.scene_.addPixmap(QPixmap())
+                pixmap_item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsFocusable)
+                key = None
+            # Only re-render the pixmap if the image's configuration changed
+            if key != image._param_key:
+                key = image._param_key
+                pyimg = image.configured_small(20)
+                pixmap_item.setPixmap(pil_to_qpixmap(pyimg))
+            text_item.setPos(10, y)
+            pixmap_item.setPos(100, y)
+            self.items_[image] = (text_item, pixmap_item, key)
+
+        # Remove the items of images that are no longer shown
+        for image in list(self.items_):
+            if image not in shown:
+                text_item, pixmap_item, key = self.items_.pop(image)
+                self.scene_.removeItem(text_item)
+                self.scene_.removeItem(pixmap_item)
 
 
 class Eclipsifier(QMainWindow):
@@ -474,26 +654,47 @@ class Eclipsifier(QMainWindow):
         self.save_collageb.clicked.connect(self.save_collage)
         self.collage_layout.addRow(self.save_collageb)
 
+        # The parameters and result of the last collage rendering
+        self.last_collage = None
+
         self.statusbar = self.statusBar()
         self.statusbar.showMessage("Image Viewer")
 
+        # Re-render once the inputs settle rather than on every change
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(80)
+        self.update_timer.timeout.connect(self.apply_update)
+
+        # Dragged distance not yet applied, in image pixels
+        self.drag_x = 0.0
+        self.drag_y = 0.0
+
         self.configuring = False
         self.load_images()
 
     def load_images(self):
         """Load the images from the base directory."""
-        # Add image paths to the list
-        image_paths = os.listdir(self.base_dir)
-        image_paths.sort()
-        self.images = []
-        for path in image_paths:
-            if path.endswith(".yml"):
-                continue
-            self.statusbar.showMessage(f"Loading {path}")
-            image = EclipsePicture(os.path.join(self.base_dir, path))
-            image.load_config()
-            self.images.append(image)
-            item = QListWidgetItem(f'{image.date.strftime("%H:%M:%S")} {path}')
+        # Find the image files, skipping the configuration files
+        entries = sorted(
+            (
+                entry
+                for entry in os.scandir(self.base_dir)
+                if entry.is_file() and not entry.name.endswith(".yml")
+            ),
+            key=lambda entry: entry.name,
+        )
+        self.statusbar.showMessage(f"Loading {len(entries)} images")
+
+        # Open the images and read their configurations in parallel
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.images = list(
+                executor.map(self.load_image, (entry.path for entry in entries))
+            )
+
+        # Add the images to the list
+        for entry, image in zip(entries, self.images):
+            item = QListWidgetItem(f"{image.time_str} {entry.name}")
             if image.loaded:
                 item.setBackground(
                     QColor("green") if image.included else QColor("darkgreen")
@@ -503,9 +704,17 @@ class Eclipsifier(QMainWindow):
         self.timeline.set_images(self.images)
         self.statusbar.showMessage(f"Loaded {len(self.images)} images")
 
+    def load_image(self, path: str):
+        """Open an image and load its configuration."""
+        image = EclipsePicture(path)
+        image.load_config()
+        return image
+
     def show_image(self, current_item: QListWidgetItem, previous_item: QListWidgetItem):
         """Show the selected image."""
         self.current_image: EclipsePicture = current_item._image  # type: ignore
+        self.drag_x = 0.0
+        self.drag_y = 0.0
         self.showit()
         # Update the inputs with the current image's configuration
         self.configuring = True
@@ -523,7 +732,7 @@ class Eclipsifier(QMainWindow):
         self.configuring = False
 
     def update_parameters(self):
-        """Update the current image's configuration with the values from the inputs, and show the image."""
+        """Update the current image's configuration with the values from the inputs, and schedule showing the image."""
         if self.configuring:
             return
         self.current_image.cx = self.cx.value()
@@ -533,7 +742,10 @@ class Eclipsifier(QMainWindow):
         self.current_image.included = self.include.checkState() == Qt.CheckState.Checked
         self.current_image.brightness = self.brightness.value()
         self.current_image.contrast = self.contrast.value()
-        self.current_image.invalidate()
+        self.update_timer.start()
+
+    def apply_update(self):
+        """Show the changes made to the current image's configuration."""
         self.timeline.set_images(self.images)
         self.showit()
 
@@ -544,18 +756,25 @@ class Eclipsifier(QMainWindow):
                 pyimg = self.current_image.configured_best()
             else:
                 pyimg = self.current_image.configured()
-            image = ImageQt.ImageQt(pyimg)
-            pixmap = QPixmap.fromImage(image)
-            self.image_label.setPixmap(pixmap)
+            self.image_label.setPixmap(pil_to_qpixmap(pyimg))
         except Exception as e:
             print(e)
             self.statusbar.showMessage(str(e))
 
     def ondrag(self, delta):
         """Handle dragging the sun into position."""
-        self.current_image.cx -= delta.x() * (100 / self.current_image.zoom)
-        self.current_image.cy -= delta.y() * (100 / self.current_image.zoom)
-        self.current_image.invalidate()
+        # Accumulate the movement and only re-render once it adds up to whole pixels
+        scale = 100 / self.current_image.zoom
+        self.drag_x -= delta.x() * scale
+        self.drag_y -= delta.y() * scale
+        dx = int(self.drag_x)
+        dy = int(self.drag_y)
+        if not dx and not dy:
+            return
+        self.drag_x -= dx
+        self.drag_y -= dy
+        self.current_image.cx += dx
+        self.current_image.cy += dy
         self.showit()
         self.configuring = True
         self.cx.setValue(self.current_image.cx)
@@ -572,20 +791,27 @@ class Eclipsifier(QMainWindow):
         else:
             vw = 640
             vh = 640 * self.collage_height.value() // self.collage_width.value()
-        collage = Collage(
-            self.images,
+        collage_image = self.render_collage().resize((vw, vh), Image.Resampling.BICUBIC)
+        self.collage_image.setPixmap(pil_to_qpixmap(collage_image))
+
+    def save_collage(self):
+        """Save the collage to a file."""
+        collage_image = self.render_collage()
+        collage_image.save("collage.png")
+
+    def render_collage(self):
+        """Render the collage, reusing the last rendering if nothing has changed since."""
+        included = [image for image in self.images if image.included]
+        params = (
             self.collage_image_size.value(),
             self.collage_width.value(),
             self.collage_height.value(),
             self.collage_central.value(),
+            tuple(id(image) for image in included),
+            tuple(image._param_key for image in included),
         )
-        collage_image = collage.render().resize((vw, vh), Image.Resampling.BICUBIC)
-        image = ImageQt.ImageQt(collage_image)
-        pixmap = QPixmap.fromImage(image)
-        self.collage_image.setPixmap(pixmap)
-
-    def save_collage(self):
-        """Save the collage to a file."""
+        if self.last_collage and self.last_collage[0] == params:
+            return self.last_collage[1]
         collage = Collage(
             self.images,
             self.collage_image_size.value(),
@@ -594,7 +820,8 @@ class Eclipsifier(QMainWindow):
             self.collage_central.value(),
         )
         collage_image = collage.render()
-        collage_image.save("collage.png")
+        self.last_collage = (params, collage_image)
+        return collage_image
 
     def save(self):
         """Save the current image's configuration to a file."""
@@ -609,7 +836,7 @@ if __name__ == "__main__":
         "base_dir": "./eclipse",
     }
     try:
-        config.update(yaml.safe_load(open("config.yml")))
+        config.update(yaml.load(open("config.yml"), Loader=Loader))
     except FileNotFoundError:
         pass
     app = QApplication(sys.argv)